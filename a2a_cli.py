@@ -6,19 +6,38 @@ A comprehensive CLI tool for interacting with the multi-agent system
 and leveraging MCP (Model Context Protocol) tools.
 """
 
+import ast
 import click
+import copy
+import csv
+import hashlib
+import io
 import requests
 import json
 import os
 import sys
 import time
 import logging
-from datetime import datetime
+import math
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from colorama import init, Fore, Back, Style
+from requests.adapters import HTTPAdapter
 import threading
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: writes stay atomic, but concurrent sets are not serialized
+    fcntl = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = pq = None
 
 # Initialize colorama for cross-platform colored output
 init(autoreset=True)
@@ -26,61 +45,241 @@ init(autoreset=True)
 # Configuration
 DEFAULT_CONFIG = {
     "registry_url": "http://localhost:8000",
+    "registry_urls": [],
     "log_level": "INFO",
     "timeout": 30,
     "max_retries": 3,
-    "output_format": "table"
+    "output_format": "table",
+    "max_workers": 8
+}
+
+# Environment variables: A2A_<KEY> overrides any DEFAULT_CONFIG key
+ENV_PREFIX = "A2A_"
+PROFILE_ENV = "A2A_PROFILE"
+CONFIG_DIR_ENV = "A2A_CONFIG_DIR"
+
+# Header telling agents when nobody will be waiting for a task result anymore
+DEADLINE_HEADER = "X-A2A-Deadline"
+
+# urllib3's default number of connections kept per host
+DEFAULT_POOL_SIZE = 10
+
+# MCP tool index settings
+MCP_INDEX_VERSION = 1
+MCP_PARALLEL_THRESHOLD = 256  # parsing is ~0.1 ms/file; process startup costs far more
+TOOL_NAME_KEYS = ("TOOL_NAME", "NAME")
+TOOL_DESCRIPTION_KEYS = ("TOOL_DESCRIPTION", "DESCRIPTION")
+TOOL_SCHEMA_KEYS = ("INPUT_SCHEMA", "PARAMETERS", "SCHEMA")
+TOOL_METHOD_NAMES = ("run", "_run", "execute", "__call__")
+JSON_SCHEMA_TYPES = {
+    "str": "string", "int": "integer", "float": "number", "bool": "boolean",
+    "list": "array", "List": "array", "tuple": "array", "Tuple": "array",
+    "dict": "object", "Dict": "object",
 }
 
+def _atomic_write_json(path: Path, data: Any):
+    """Write JSON to a temporary file and rename it over the target"""
+    tmp_file = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_file, 'w') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+    finally:
+        if tmp_file.exists():
+            tmp_file.unlink()
+
+def _coerce_config_value(key: str, value: str) -> Any:
+    """Convert a string setting to the type of its DEFAULT_CONFIG entry
+    
+    List settings accept a JSON list or comma-separated values; keys not in
+    DEFAULT_CONFIG are parsed as JSON, falling back to a string.
+    """
+    default = DEFAULT_CONFIG.get(key)
+    if isinstance(default, list):
+        if value.lstrip().startswith("["):
+            try:
+                items = json.loads(value)
+            except ValueError as e:
+                raise click.BadParameter(f"{key} is not a valid JSON list: {e}")
+            if not all(isinstance(item, str) for item in items):
+                raise click.BadParameter(f"{key} must be a list of strings, got {value!r}")
+            return items
+        return [item.strip() for item in value.split(",") if item.strip()]
+    if isinstance(default, int):
+        try:
+            return int(value)
+        except ValueError:
+            raise click.BadParameter(f"{key} must be an integer, got {value!r}")
+    if key in DEFAULT_CONFIG:
+        return value
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+def _env_overrides() -> Dict[str, Any]:
+    """Read A2A_<KEY> environment overrides, coerced to the default's type"""
+    overrides = {}
+    for key in DEFAULT_CONFIG:
+        value = os.environ.get(f"{ENV_PREFIX}{key.upper()}")
+        if value is None:
+            continue
+        try:
+            overrides[key] = _coerce_config_value(key, value)
+        except click.BadParameter as e:
+            click.echo(f"{Fore.YELLOW}Warning: Ignoring {ENV_PREFIX}{key.upper()}: {e.message}")
+    return overrides
+
 class A2AConfig:
-    """Configuration manager for A2A CLI"""
+    """Configuration manager for A2A CLI
     
-    def __init__(self):
-        self.config_dir = Path.home() / ".a2a"
+    Settings are resolved as defaults < config file < active profile <
+    environment variables. Profiles live under the "profiles" key of the
+    config file and are selected with --profile or A2A_PROFILE.
+    """
+    
+    # Parsed config files shared by all instances, keyed by path
+    _cache: Dict[str, Any] = {}
+    
+    def __init__(self, profile: Optional[str] = None):
+        self.config_dir = Path(os.environ.get(CONFIG_DIR_ENV) or Path.home() / ".a2a")
         self.config_file = self.config_dir / "config.json"
-        self.config_dir.mkdir(exist_ok=True)
+        self.lock_file = self.config_dir / "config.json.lock"
+        self.config_dir.mkdir(parents=True, exist_ok=True)
+        self.profile = profile or os.environ.get(PROFILE_ENV)
         self.config = self._load_config()
     
+    def _read_file(self, use_cache: bool = True) -> Dict[str, Any]:
+        """Return the raw config file contents, re-parsing only when it changed"""
+        try:
+            stat = self.config_file.stat()
+        except FileNotFoundError:
+            return {}
+        
+        # Every atomic replace creates a new inode, so include it in the stamp
+        key = str(self.config_file)
+        stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        cached = self._cache.get(key)
+        if not use_cache or not cached or cached[0] != stamp:
+            with open(self.config_file, 'r') as f:
+                cached = (stamp, json.load(f))
+            self._cache[key] = cached
+        return copy.deepcopy(cached[1])
+    
     def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from file or create default"""
-        if self.config_file.exists():
+        """Load configuration from file, profile and environment"""
+        try:
+            raw = self._read_file()
+        except Exception as e:
+            click.echo(f"{Fore.YELLOW}Warning: Could not load config file: {e}")
+            raw = {}
+        
+        profiles = raw.pop("profiles", {})
+        config = {**DEFAULT_CONFIG, **raw}
+        if self.profile:
+            if self.profile in profiles:
+                config.update(profiles[self.profile])
+            else:
+                click.echo(f"{Fore.YELLOW}Warning: Unknown profile '{self.profile}'")
+        env = _env_overrides()
+        if "registry_url" in env and "registry_urls" not in env:
+            # An explicit single registry replaces any list from file or profile
+            env["registry_urls"] = []
+        config.update(env)
+        return config
+    
+    @contextmanager
+    def _locked(self):
+        """Hold an exclusive lock on the config file for read-modify-write"""
+        with open(self.lock_file, 'a') as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
             try:
-                with open(self.config_file, 'r') as f:
-                    return {**DEFAULT_CONFIG, **json.load(f)}
-            except Exception as e:
-                click.echo(f"{Fore.YELLOW}Warning: Could not load config file: {e}")
-        return DEFAULT_CONFIG.copy()
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
     
-    def save_config(self):
-        """Save current configuration to file"""
+    def _update_file(self, update):
+        """Apply update to the raw config under lock and write it atomically"""
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            with self._locked():
+                raw = self._read_file(use_cache=False)
+                update(raw)
+                _atomic_write_json(self.config_file, raw)
         except Exception as e:
             click.echo(f"{Fore.RED}Error saving config: {e}")
+        self.config = self._load_config()
+    
+    def save_config(self):
+        """Save current configuration to file
+        
+        Only values changed in memory are written, so settings coming from
+        the active profile or the environment are not baked into the file.
+        """
+        effective = self._load_config()
+        changes = {k: v for k, v in self.config.items() if k not in effective or effective[k] != v}
+        self._update_file(lambda data: data.update(changes))
     
     def get(self, key: str, default=None):
         """Get configuration value"""
         return self.config.get(key, default)
     
-    def set(self, key: str, value: Any):
-        """Set configuration value"""
-        self.config[key] = value
-        self.save_config()
+    def set(self, key: str, value: Any, profile: Optional[str] = None):
+        """Set configuration value, in the base config or a named profile"""
+        if profile:
+            self._update_file(lambda data: data.setdefault("profiles", {}).setdefault(profile, {}).update({key: value}))
+        else:
+            self._update_file(lambda data: data.update({key: value}))
+    
+    def profiles(self) -> Dict[str, Dict[str, Any]]:
+        """Return the profiles defined in the config file"""
+        try:
+            return self._read_file().get("profiles", {})
+        except Exception:
+            return {}
+    
+    def use_profile(self, profile: str):
+        """Switch to a named profile"""
+        if profile not in self.profiles():
+            raise click.BadParameter(f"Unknown profile '{profile}'", param_hint="--profile")
+        self.profile = profile
+        self.config = self._load_config()
 
 class A2AClient:
     """Client for interacting with the A2A multi-agent system"""
     
     def __init__(self, config: A2AConfig):
         self.config = config
-        self.registry_url = config.get("registry_url")
-        self.timeout = config.get("timeout", 30)
+        self.registry_errors: Dict[str, str] = {}
         self.session = requests.Session()
-        self.session.timeout = self.timeout
+        self.apply_config()
         
         # Setup logging
         self._setup_logging()
     
+    def apply_config(self):
+        """(Re)read connection settings from the configuration"""
+        self.registry_url = self.config.get("registry_url")
+        registry_urls = self.config.get("registry_urls") or []
+        if isinstance(registry_urls, str):
+            registry_urls = [url.strip() for url in registry_urls.split(",") if url.strip()]
+        elif not isinstance(registry_urls, list) or not all(isinstance(url, str) for url in registry_urls):
+            click.echo(f"{Fore.YELLOW}Warning: Ignoring registry_urls, expected a list of URLs: {registry_urls!r}")
+            registry_urls = []
+        self.registry_urls = registry_urls or [self.registry_url]
+        self.timeout = self.config.get("timeout", 30)
+        self.max_workers = self.config.get("max_workers", 8)
+        self.configure_pool(self.max_workers)
+    
+    def configure_pool(self, size: int):
+        """Size the connection pool for up to size concurrent requests per host"""
+        adapter = HTTPAdapter(pool_maxsize=max(size, DEFAULT_POOL_SIZE))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+    
     def _setup_logging(self):
         """Setup logging configuration"""
         log_dir = Path("logs")
@@ -98,49 +297,611 @@ class A2AClient:
         )
         self.logger = logging.getLogger(__name__)
     
+    def _fetch_registry(self, registry_url: str) -> List[Dict[str, Any]]:
+        """Fetch the agent list from a single registry"""
+        response = self.session.get(f"{registry_url}/agents", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+    
     def get_agents(self) -> List[Dict[str, Any]]:
-        """Get list of available agents"""
-        try:
-            response = self.session.get(f"{self.registry_url}/agents")
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            self.logger.error(f"Failed to get agents: {e}")
-            raise click.ClickException(f"Failed to connect to registry: {e}")
+        """Get agents from all registries, deduplicated by endpoint
+        
+        Registries are queried concurrently. Each agent is tagged with the
+        registry it came from; registries that fail are recorded in
+        registry_errors and only an error if every registry fails.
+        """
+        self.registry_errors = {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(self.registry_urls))) as executor:
+            futures = {url: executor.submit(self._fetch_registry, url) for url in self.registry_urls}
+        
+        agents = {}
+        for url, future in futures.items():
+            try:
+                registry_agents = future.result()
+            except Exception as e:
+                self.logger.error(f"Failed to get agents from {url}: {e}")
+                self.registry_errors[url] = str(e)
+                continue
+            for agent in registry_agents:
+                key = str(agent.get("endpoint", "")).rstrip("/") or f"{url}#{agent.get('name')}"
+                if key in agents:
+                    agents[key]["registries"].append(url)
+                else:
+                    agents[key] = {**agent, "registry": url, "registries": [url]}
+        
+        if len(self.registry_errors) == len(self.registry_urls):
+            errors = "; ".join(f"{url}: {e}" for url, e in self.registry_errors.items())
+            raise click.ClickException(f"Failed to connect to registry: {errors}")
+        return list(agents.values())
+    
+    def get_agents_health(self, agents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Get health of many agents concurrently, in the same order"""
+        if not agents:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(agents))) as executor:
+            return list(executor.map(lambda agent: self.get_agent_health(agent.get("endpoint")), agents))
     
     def get_agent_health(self, endpoint: str) -> Dict[str, Any]:
         """Get health status of a specific agent"""
         try:
-            response = self.session.get(f"{endpoint}/health")
+            response = self.session.get(f"{endpoint}/health", timeout=self.timeout)
             response.raise_for_status()
             return response.json()
         except Exception as e:
             return {"status": "error", "error": str(e)}
     
-    def submit_task(self, endpoint: str, prompt: str, data=None) -> Dict[str, Any]:
-        """Submit a task to an agent"""
+    def submit_task(self, endpoint: str, prompt: str, data=None,
+                    deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Submit a task to an agent, optionally with a deadline (epoch seconds)"""
         try:
             payload = {"prompt": prompt}
             if data:
                 payload["data"] = data
             
-            response = self.session.post(f"{endpoint}/task", json=payload)
+            headers = {}
+            if deadline is not None:
+                headers[DEADLINE_HEADER] = datetime.fromtimestamp(deadline, timezone.utc).isoformat()
+            
+            response = self.session.post(f"{endpoint}/task", json=payload, headers=headers,
+                                         timeout=self.timeout)
             response.raise_for_status()
             return response.json()
         except Exception as e:
             self.logger.error(f"Failed to submit task: {e}")
             raise click.ClickException(f"Failed to submit task: {e}")
     
+    def cancel_task(self, endpoint: str, task_id: str) -> Dict[str, Any]:
+        """Ask an agent to cancel a task"""
+        try:
+            response = self.session.post(f"{endpoint}/task/{task_id}/cancel", timeout=self.timeout)
+            response.raise_for_status()
+            return response.json() if response.content else {}
+        except Exception as e:
+            self.logger.error(f"Failed to cancel task: {e}")
+            raise click.ClickException(f"Failed to cancel task: {e}")
+    
     def get_task_status(self, endpoint: str, task_id: str) -> Dict[str, Any]:
         """Get status of a specific task"""
         try:
-            response = self.session.get(f"{endpoint}/task/{task_id}/status")
+            response = self.session.get(f"{endpoint}/task/{task_id}/status", timeout=self.timeout)
             response.raise_for_status()
             return response.json()
         except Exception as e:
             self.logger.error(f"Failed to get task status: {e}")
             raise click.ClickException(f"Failed to get task status: {e}")
 
+def _dotted_name(node) -> str:
+    """Return the dotted name of a Name/Attribute/Call AST node"""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        parent = _dotted_name(node.value)
+        return f"{parent}.{node.attr}" if parent else node.attr
+    if isinstance(node, ast.Call):
+        return _dotted_name(node.func)
+    return ""
+
+def _literal(node) -> Any:
+    """Evaluate a literal AST node, returning None for anything dynamic"""
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError):
+        return None
+
+def _annotation_type(node) -> str:
+    """Map a type annotation AST node to a JSON schema type name"""
+    if node is None:
+        return "any"
+    if isinstance(node, ast.Subscript):
+        inner = node.slice.value if sys.version_info < (3, 9) else node.slice
+        if _dotted_name(node.value).split(".")[-1] == "Optional":
+            return _annotation_type(inner)
+        node = node.value
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        name = node.value
+    else:
+        name = _dotted_name(node)
+    return JSON_SCHEMA_TYPES.get(name.split(".")[-1], "any")
+
+def _first_line(docstring: Optional[str]) -> str:
+    """Return the summary line of a docstring"""
+    return docstring.strip().splitlines()[0] if docstring and docstring.strip() else ""
+
+def _function_parameters(func) -> Dict[str, Any]:
+    """Build a parameter schema from a function signature"""
+    args = func.args
+    positional = list(args.posonlyargs) + list(args.args)
+    defaults = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+    pairs = list(zip(positional, defaults)) + list(zip(args.kwonlyargs, args.kw_defaults))
+    
+    params = {}
+    for arg, default in pairs:
+        if arg.arg in ("self", "cls"):
+            continue
+        spec = {"type": _annotation_type(arg.annotation), "required": default is None}
+        if default is not None:
+            spec["default"] = _literal(default)
+        params[arg.arg] = spec
+    return params
+
+def _string_assignments(body) -> Dict[str, Any]:
+    """Collect literal values assigned to simple names in a block"""
+    values = {}
+    for node in body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target, value = node.targets[0], node.value
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            target, value = node.target, node.value
+        else:
+            continue
+        if isinstance(target, ast.Name):
+            values[target.id] = _literal(value)
+    return values
+
+def _pick(values: Dict[str, Any], keys, expected_type):
+    """Return the first value under one of keys with the expected type"""
+    for key in keys:
+        if isinstance(values.get(key), expected_type):
+            return values[key]
+    return None
+
+def _decorated_tool(func) -> Optional[Dict[str, Any]]:
+    """Extract tool metadata from a function decorated with @tool / @mcp.tool()"""
+    for decorator in func.decorator_list:
+        if _dotted_name(decorator).split(".")[-1] != "tool":
+            continue
+        keywords = {}
+        if isinstance(decorator, ast.Call):
+            keywords = {kw.arg: _literal(kw.value) for kw in decorator.keywords if kw.arg}
+        name = keywords.get("name")
+        description = keywords.get("description")
+        return {
+            "name": name if isinstance(name, str) else func.name,
+            "description": description if isinstance(description, str)
+                           else _first_line(ast.get_docstring(func)),
+            "parameters": _function_parameters(func),
+        }
+    return None
+
+def _class_tool(cls) -> Optional[Dict[str, Any]]:
+    """Extract tool metadata from a class declaring name/description attributes"""
+    attributes = _string_assignments(cls.body)
+    name = _pick(attributes, ("name",) + TOOL_NAME_KEYS, str)
+    if not name:
+        return None
+    description = _pick(attributes, ("description",) + TOOL_DESCRIPTION_KEYS, str)
+    schema = _pick(attributes, ("input_schema", "parameters") + TOOL_SCHEMA_KEYS, dict)
+    if schema is None:
+        method = next((n for n in cls.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))
+                       and n.name in TOOL_METHOD_NAMES), None)
+        schema = _function_parameters(method) if method else {}
+    return {
+        "name": name,
+        "description": description or _first_line(ast.get_docstring(cls)),
+        "parameters": schema,
+    }
+
+def _parse_tool_file(path: str) -> Dict[str, Any]:
+    """Statically extract MCP tool metadata from a module without importing it"""
+    source = Path(path).read_bytes()
+    entry = {
+        "name": Path(path).stem,
+        "description": "",
+        "tools": [],
+        "sha256": hashlib.sha256(source).hexdigest(),
+    }
+    try:
+        tree = ast.parse(source, filename=path)
+    except (SyntaxError, ValueError) as e:
+        entry["error"] = f"Could not parse: {e}"
+        return entry
+    
+    constants = _string_assignments(tree.body)
+    entry["name"] = _pick(constants, TOOL_NAME_KEYS, str) or entry["name"]
+    entry["description"] = (_pick(constants, TOOL_DESCRIPTION_KEYS, str)
+                            or _first_line(ast.get_docstring(tree)))
+    
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            tool = _decorated_tool(node)
+        elif isinstance(node, ast.ClassDef):
+            tool = _class_tool(node)
+        else:
+            tool = None
+        if tool:
+            entry["tools"].append(tool)
+    
+    # Modules describing a single tool through constants
+    schema = _pick(constants, TOOL_SCHEMA_KEYS, dict)
+    if not entry["tools"] and schema is not None:
+        entry["tools"].append({
+            "name": entry["name"],
+            "description": entry["description"],
+            "parameters": schema,
+        })
+    return entry
+
+class ToolIndex:
+    """Cached metadata index of MCP tool modules, refreshed incrementally"""
+    
+    def __init__(self, index_file: Path):
+        self.index_file = index_file
+    
+    def _load(self) -> Dict[str, Any]:
+        """Load the cached index, discarding it if unreadable or outdated"""
+        try:
+            with open(self.index_file, 'r') as f:
+                data = json.load(f)
+            if data.get("version") == MCP_INDEX_VERSION:
+                return data
+        except (OSError, ValueError):
+            pass
+        return {"version": MCP_INDEX_VERSION, "directories": {}}
+    
+    def refresh(self, tools_dir: Path, force: bool = False) -> List[Dict[str, Any]]:
+        """Return index entries for tools_dir, re-parsing only changed files"""
+        tools_dir = tools_dir.resolve()
+        data = self._load()
+        cached = {} if force else data["directories"].get(str(tools_dir), {})
+        
+        entries = {}
+        to_parse = []
+        changed = False
+        for tool_file in sorted(tools_dir.glob("*.py")):
+            if tool_file.name == "__init__.py":
+                continue
+            stat = tool_file.stat()
+            entry = cached.get(tool_file.name)
+            if entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                entries[tool_file.name] = entry
+                continue
+            
+            # Touched but unchanged files only need their stat refreshed
+            if entry and hashlib.sha256(tool_file.read_bytes()).hexdigest() == entry["sha256"]:
+                entry.update(mtime=stat.st_mtime_ns, size=stat.st_size)
+                entries[tool_file.name] = entry
+            else:
+                to_parse.append((tool_file, stat))
+            changed = True
+        
+        paths = [str(tool_file) for tool_file, _ in to_parse]
+        if len(paths) >= MCP_PARALLEL_THRESHOLD:
+            chunksize = max(1, len(paths) // ((os.cpu_count() or 1) * 4))
+            with ProcessPoolExecutor() as executor:
+                parsed = list(executor.map(_parse_tool_file, paths, chunksize=chunksize))
+        else:
+            parsed = [_parse_tool_file(path) for path in paths]
+        
+        for (tool_file, stat), entry in zip(to_parse, parsed):
+            entry.update(file=tool_file.name, mtime=stat.st_mtime_ns, size=stat.st_size)
+            entries[tool_file.name] = entry
+        
+        if changed or set(entries) != set(cached):
+            data["directories"][str(tools_dir)] = entries
+            _atomic_write_json(self.index_file, data)
+        
+        return [entries[name] for name in sorted(entries)]
+    
+    def find(self, tools_dir: Path, name: str) -> Optional[Dict[str, Any]]:
+        """Find an indexed module by file stem, module name or tool name"""
+        entries = self.refresh(tools_dir)
+        for entry in entries:
+            if name in (Path(entry["file"]).stem, entry["name"]):
+                return entry
+        for entry in entries:
+            if any(tool["name"] == name for tool in entry["tools"]):
+                return entry
+        return None
+
+EXPORT_FIELDS = [
+    "task_id", "endpoint", "state", "handled_by", "output", "output_count",
+    "output_bytes", "duration_s", "latency_ms", "exported_at", "error",
+]
+EXPORT_NUMERIC_FIELDS = {"output_count": int, "output_bytes": int, "duration_s": float, "latency_ms": float}
+EXPORT_BATCH_SIZE = 500  # rows per Parquet row group
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp, accepting a trailing Z"""
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+def _task_duration(status: Dict[str, Any]) -> Optional[float]:
+    """Work out how long a task ran from its status, if the agent reports it"""
+    if isinstance(status.get("duration"), (int, float)):
+        return float(status["duration"])
+    started = _parse_timestamp(status.get("started_at") or status.get("created_at"))
+    finished = _parse_timestamp(status.get("completed_at") or status.get("finished_at"))
+    if started and finished:
+        try:
+            return (finished - started).total_seconds()
+        except TypeError:  # mixed naive/aware timestamps
+            return None
+    return None
+
+def _percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+class ExportStats:
+    """Running summary statistics for a task export"""
+    
+    def __init__(self):
+        self.total = 0
+        self.states: Dict[str, int] = {}
+        self.errors = 0
+        self.output_bytes = 0
+        self.durations: List[float] = []
+        self.latencies: List[float] = []
+    
+    def add(self, record: Dict[str, Any]):
+        """Fold one exported record into the statistics"""
+        self.total += 1
+        if record.get("error"):
+            self.errors += 1
+            return
+        state = record.get("state") or "unknown"
+        self.states[state] = self.states.get(state, 0) + 1
+        self.output_bytes += record.get("output_bytes") or 0
+        if record.get("duration_s") is not None:
+            self.durations.append(record["duration_s"])
+        if record.get("latency_ms") is not None:
+            self.latencies.append(record["latency_ms"])
+    
+    def summary(self) -> Dict[str, Any]:
+        """Return the statistics as a flat dictionary"""
+        fetched = self.total - self.errors
+        durations, latencies = sorted(self.durations), sorted(self.latencies)
+        return {
+            "tasks": self.total,
+            "fetch_errors": self.errors,
+            "states": dict(self.states),
+            "success_rate": self.states.get("completed", 0) / fetched if fetched else None,
+            "output_bytes_total": self.output_bytes,
+            "output_bytes_avg": self.output_bytes / fetched if fetched else None,
+            "duration_p50_s": _percentile(durations, 50),
+            "duration_p90_s": _percentile(durations, 90),
+            "duration_p99_s": _percentile(durations, 99),
+            "latency_p50_ms": _percentile(latencies, 50),
+            "latency_p95_ms": _percentile(latencies, 95),
+        }
+
+class TaskExportWriter:
+    """Stream export records to a JSONL, CSV or Parquet file
+    
+    JSONL and CSV are appended to as records arrive. Parquet files cannot be
+    appended to, so they are written in row groups to a temporary file that
+    replaces the target on close.
+    """
+    
+    def __init__(self, path: Path, format: str, resume: bool = False):
+        if format == "parquet" and pq is None:
+            raise click.ClickException("Parquet export requires pyarrow (pip install pyarrow)")
+        self.path = path
+        self.format = format
+        self.resume = resume
+        self._file = None
+        self._csv = None
+        self._parquet = None
+        self._batch: List[Dict[str, Any]] = []
+        self._existing_rows = 0
+        self._tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    
+    def read_existing(self) -> List[Dict[str, Any]]:
+        """Return records already in the file, for resuming an export
+        
+        A half-written last row left by an interrupted export is skipped and,
+        when resuming, cut off the file so new rows are not appended to it.
+        """
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return []
+        if self.format == "parquet":
+            records = pq.read_table(self.path).to_pylist()
+            self._existing_rows = len(records)
+            return records
+        
+        data = self.path.read_bytes()
+        complete = data[:data.rfind(b"\n") + 1]
+        if self.format == "jsonl":
+            lines = [line for line in complete.decode("utf-8").splitlines(keepends=True) if line.strip()]
+            if lines:
+                try:
+                    json.loads(lines[-1])
+                except ValueError:
+                    complete = complete[:len(complete) - len(lines[-1].encode("utf-8"))]
+                    lines.pop()
+            records = [json.loads(line) for line in lines]
+        else:
+            records, complete = self._read_complete_csv(complete.decode("utf-8"))
+        if self.resume and len(complete) < len(data):
+            with open(self.path, 'rb+') as f:
+                f.truncate(len(complete))
+        
+        for record in records:
+            for field, cast in EXPORT_NUMERIC_FIELDS.items():
+                if record.get(field) in ("", None):
+                    record[field] = None
+                else:
+                    record[field] = cast(record[field])
+            record["error"] = record.get("error") or None
+        self._existing_rows = len(records)
+        return records
+    
+    def _read_complete_csv(self, text: str):
+        """Parse CSV rows, stopping before a truncated final record
+        
+        Outputs may contain newlines inside quoted fields, so a crash can leave
+        a last line that ends in "\\n" but is still inside an open quote. Returns
+        the complete records and the bytes of the file they occupy.
+        """
+        consumed = 0
+        
+        def lines():
+            nonlocal consumed
+            for line in io.StringIO(text, newline=''):
+                consumed += len(line)
+                yield line
+        
+        rows = []  # (row, end offset) pairs
+        reader = csv.reader(lines(), strict=True)
+        try:
+            for row in reader:
+                rows.append((row, consumed))
+        except csv.Error as e:
+            if consumed < len(text):
+                raise click.ClickException(f"Malformed CSV in {self.path} at line {reader.line_num}: {e}")
+        
+        # The header row is the first record; data rows must have every column
+        end = 0
+        if rows and len(rows[0][0]) == len(EXPORT_FIELDS):
+            end = rows[0][1]
+            for index, (row, offset) in enumerate(rows[1:], start=1):
+                if len(row) < len(EXPORT_FIELDS):
+                    if index != len(rows) - 1:
+                        raise click.ClickException(f"Malformed CSV row in {self.path}: {row!r}")
+                    break
+                end = offset
+        
+        complete = text[:end]
+        header, *data_rows = [row for row, offset in rows if offset <= end] or [[]]
+        return [dict(zip(header, row)) for row in data_rows], complete.encode("utf-8")
+    
+    def open(self, carried_over: List[Dict[str, Any]]):
+        """Open the output, keeping carried_over records from a previous run"""
+        if self.format == "parquet":
+            arrow_types = {int: pa.int64(), float: pa.float64()}
+            schema = pa.schema([
+                (field, arrow_types.get(EXPORT_NUMERIC_FIELDS.get(field), pa.string()))
+                for field in EXPORT_FIELDS
+            ])
+            self._parquet = pq.ParquetWriter(str(self._tmp_path), schema)
+            for record in carried_over:
+                self.write(record)
+            return
+        
+        append = self.resume and self.path.exists() and self.path.stat().st_size > 0
+        if append and len(carried_over) != self._existing_rows:
+            # Drop superseded rows (e.g. fetch errors being retried) before appending
+            self._open_file(self._tmp_path, 'w', header=True)
+            for record in carried_over:
+                self.write(record)
+            self._file.close()
+            os.replace(self._tmp_path, self.path)
+        self._open_file(self.path, 'a' if append else 'w', header=not append)
+    
+    def _open_file(self, path: Path, mode: str, header: bool):
+        """Open a JSONL/CSV file for writing"""
+        self._file = open(path, mode, newline='')
+        if self.format == "csv":
+            self._csv = csv.DictWriter(self._file, fieldnames=EXPORT_FIELDS)
+            if header:
+                self._csv.writeheader()
+    
+    def write(self, record: Dict[str, Any]):
+        """Write a single record"""
+        if self._parquet:
+            self._batch.append({field: record.get(field) for field in EXPORT_FIELDS})
+            if len(self._batch) >= EXPORT_BATCH_SIZE:
+                self._flush_batch()
+        elif self._csv:
+            self._csv.writerow({field: record.get(field) for field in EXPORT_FIELDS})
+            self._file.flush()
+        else:
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+    
+    def _flush_batch(self):
+        """Write pending Parquet rows as a row group"""
+        if self._batch:
+            self._parquet.write_table(pa.Table.from_pylist(self._batch, schema=self._parquet.schema))
+            self._batch = []
+    
+    def close(self):
+        """Flush and close the output"""
+        if self._parquet:
+            self._flush_batch()
+            self._parquet.close()
+            os.replace(self._tmp_path, self.path)
+        elif self._file:
+            self._file.close()
+
+def fetch_task_record(endpoint: str, task_id: str) -> Dict[str, Any]:
+    """Fetch a task's status and flatten it into an export record"""
+    record = {"task_id": task_id, "endpoint": endpoint}
+    start_time = time.time()
+    try:
+        status = client.get_task_status(endpoint, task_id)
+    except Exception as e:
+        record["error"] = str(getattr(e, "message", e))
+        status = None
+    record["latency_ms"] = round((time.time() - start_time) * 1000, 2)
+    record["exported_at"] = datetime.now(timezone.utc).isoformat()
+    
+    if status is not None:
+        contents = [str(output.get("content", "")) for output in status.get("outputs") or []]
+        output = "\n".join(contents)
+        record.update(
+            state=status.get("state", "unknown"),
+            handled_by=status.get("handled_by"),
+            output=output,
+            output_count=len(contents),
+            output_bytes=len(output.encode("utf-8")),
+            duration_s=_task_duration(status),
+            error=None,
+        )
+    return {field: record.get(field) for field in EXPORT_FIELDS}
+
+def export_task_results(tasks: List[tuple], writer: TaskExportWriter, stats: ExportStats,
+                        concurrency: int, progress=None):
+    """Fetch (task_id, endpoint) pairs concurrently and stream them to writer
+    
+    At most concurrency requests are in flight at once; records are written
+    in completion order as soon as they arrive.
+    """
+    pending = iter(tasks)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        in_flight = set()
+        while True:
+            for task_id, endpoint in pending:
+                in_flight.add(executor.submit(fetch_task_record, endpoint, task_id))
+                if len(in_flight) >= concurrency:
+                    break
+            if not in_flight:
+                break
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                record = future.result()
+                writer.write(record)
+                stats.add(record)
+                if progress:
+                    progress.update(1)
+
 # Global configuration and client
 config = A2AConfig()
 client = A2AClient(config)
@@ -172,17 +933,66 @@ def print_table(headers: List[str], rows: List[List[str]], title: str = None):
         formatted_row = " | ".join(f"{str(cell):<{col_widths[i]}}" for i, cell in enumerate(row))
         click.echo(formatted_row)
 
+def report_registry_errors():
+    """Warn about registries that failed during the last agent lookup"""
+    for url, error in client.registry_errors.items():
+        click.echo(f"{Fore.YELLOW}Warning: registry {url} unavailable: {error}", err=True)
+
 @click.group()
 @click.version_option(version="1.0.0")
-def cli():
+@click.option("--profile", help="Configuration profile to use (default: $A2A_PROFILE)")
+def cli(profile):
     """
     A2A CLI - Advanced AI Agent Command Line Interface
     
     A comprehensive tool for interacting with the multi-agent system
     and leveraging MCP (Model Context Protocol) tools.
     """
+    if profile:
+        config.use_profile(profile)
+        client.apply_config()
+
+@cli.group("config")
+def config_group():
+    """View and edit CLI configuration and profiles"""
     pass
 
+@config_group.command("show")
+def config_show():
+    """Show the effective configuration"""
+    title = f"Configuration (profile: {config.profile})" if config.profile else "Configuration"
+    click.echo(f"\n{Fore.CYAN}{Style.BRIGHT}{title}{Style.RESET_ALL}")
+    click.echo("=" * len(title))
+    for key, value in config.config.items():
+        click.echo(f"{Fore.GREEN}{key}:{Style.RESET_ALL} {json.dumps(value)}")
+
+@config_group.command("set")
+@click.argument("key")
+@click.argument("value")
+@click.option("--profile", "target_profile", help="Store the value in this profile instead of the base config")
+def config_set(key, value, target_profile):
+    """Set a configuration value
+    
+    VALUE is converted to the setting's type: lists take comma-separated
+    values or a JSON list, numeric settings must be integers.
+    """
+    try:
+        value = _coerce_config_value(key, value)
+    except click.BadParameter as e:
+        e.param_hint = "VALUE"
+        raise
+    config.set(key, value, profile=target_profile)
+    where = f" in profile '{target_profile}'" if target_profile else ""
+    click.echo(f"{Fore.GREEN}Set {key}{where}")
+
+@config_group.command("profiles")
+def config_profiles():
+    """List configuration profiles"""
+    profiles = config.profiles()
+    rows = [[name, ", ".join(f"{k}={json.dumps(v)}" for k, v in settings.items())]
+            for name, settings in sorted(profiles.items())]
+    print_table(["Profile", "Overrides"], rows, f"Profiles ({len(profiles)})")
+
 @cli.group()
 def agents():
     """Manage and interact with AI agents"""
@@ -196,20 +1006,28 @@ def list_agents(format):
         agents_data = client.get_agents()
         
         if format == "json":
+            report_registry_errors()
             click.echo(json.dumps(agents_data, indent=2))
             return
         
+        federated = len(client.registry_urls) > 1
         headers = ["Name", "Endpoint", "Status"]
+        if federated:
+            headers.append("Registry")
         rows = []
         
         for agent in agents_data:
             status = agent.get("status", "unknown")
-            rows.append([
+            row = [
                 agent.get("name", "Unknown"),
                 agent.get("endpoint", "Unknown"),
                 f"{Fore.GREEN}Active{Style.RESET_ALL}" if status == "active" else f"{Fore.RED}{status}{Style.RESET_ALL}"
-            ])
+            ]
+            if federated:
+                row.append(", ".join(agent.get("registries", [])))
+            rows.append(row)
         
+        report_registry_errors()
         print_table(headers, rows, f"Available Agents ({len(agents_data)})")
         
     except Exception as e:
@@ -227,10 +1045,10 @@ def agents_status(detailed):
             headers.extend(["Uptime", "Tasks Active"])
         
         rows = []
+        healths = client.get_agents_health(agents_data)
         
-        for agent in agents_data:
+        for agent, health in zip(agents_data, healths):
             try:
-                health = client.get_agent_health(agent["endpoint"])
                 status = health.get("status", "unknown")
                 status_color = Fore.GREEN if status == "healthy" else Fore.RED
                 
@@ -261,6 +1079,7 @@ def agents_status(detailed):
                     row.extend(["N/A", "N/A"])
                 rows.append(row)
         
+        report_registry_errors()
         print_table(headers, rows, "Agent Health Status")
         
     except Exception as e:
@@ -303,11 +1122,61 @@ def task():
     """Manage tasks and submissions"""
     pass
 
+def _cancel_quietly(endpoint: str, task_id: str, reason: str):
+    """Send a cancel request, reporting rather than raising on failure"""
+    try:
+        client.cancel_task(endpoint, task_id)
+        click.echo(f"{Fore.YELLOW}{reason} Cancellation requested for task {task_id}.")
+    except click.ClickException as e:
+        click.echo(f"{Fore.RED}{reason} Could not cancel task {task_id}: {e.message}")
+
+def wait_for_task(endpoint: str, task_id: str, timeout: float, keep_running: bool = False):
+    """Poll a task until it finishes, cancelling it on timeout, error or Ctrl-C"""
+    start_time = time.time()
+    try:
+        while time.time() - start_time < timeout:
+            status = client.get_task_status(endpoint, task_id)
+            state = status.get("state")
+            
+            if state == "completed":
+                click.echo(f"{Fore.GREEN}Task completed successfully!")
+                if status.get("outputs"):
+                    click.echo(f"{Fore.CYAN}Results:")
+                    for output in status["outputs"]:
+                        click.echo(f"  {output.get('content', '')}")
+                return
+            elif state in ("failed", "cancelled"):
+                click.echo(f"{Fore.RED}Task {state}!")
+                if status.get("outputs"):
+                    click.echo(f"{Fore.YELLOW}Error details:")
+                    for output in status["outputs"]:
+                        click.echo(f"  {output.get('content', '')}")
+                return
+            elif state == "pending":
+                click.echo(f"{Fore.YELLOW}Task still pending...")
+            
+            time.sleep(2)
+    except KeyboardInterrupt:
+        _cancel_quietly(endpoint, task_id, "Interrupted.")
+        raise
+    except click.ClickException:
+        # Polling failed, so nobody will collect the result
+        if not keep_running:
+            _cancel_quietly(endpoint, task_id, "Lost track of task.")
+        raise
+    
+    if keep_running:
+        click.echo(f"{Fore.YELLOW}Timeout reached. Task may still be running.")
+        click.echo(f"Use 'python a2a_cli.py task status {task_id} {endpoint}' to check progress.")
+    else:
+        _cancel_quietly(endpoint, task_id, "Timeout reached.")
+
 @task.command("submit")
 @click.argument("prompt")
 @click.option("--wait", is_flag=True, help="Wait for task completion")
 @click.option("--timeout", default=300, help="Timeout for waiting (seconds)")
-def submit_task(prompt, wait, timeout):
+@click.option("--keep-running", is_flag=True, help="Do not cancel the task when the wait times out")
+def submit_task(prompt, wait, timeout, keep_running=False):
     """Submit a task to the orchestrator agent"""
     try:
         # Find orchestrator agent
@@ -319,7 +1188,8 @@ def submit_task(prompt, wait, timeout):
             return
         
         click.echo(f"{Fore.CYAN}Submitting task to orchestrator...")
-        task_data = client.submit_task(orchestrator["endpoint"], prompt)
+        deadline = time.time() + timeout if wait and not keep_running else None
+        task_data = client.submit_task(orchestrator["endpoint"], prompt, deadline=deadline)
         task_id = task_data.get("task_id")
         
         click.echo(f"{Fore.GREEN}Task submitted successfully!")
@@ -328,33 +1198,7 @@ def submit_task(prompt, wait, timeout):
         
         if wait:
             click.echo(f"{Fore.CYAN}Waiting for completion (timeout: {timeout}s)...")
-            
-            start_time = time.time()
-            while time.time() - start_time < timeout:
-                status = client.get_task_status(orchestrator["endpoint"], task_id)
-                state = status.get("state")
-                
-                if state == "completed":
-                    click.echo(f"{Fore.GREEN}Task completed successfully!")
-                    if status.get("outputs"):
-                        click.echo(f"{Fore.CYAN}Results:")
-                        for output in status["outputs"]:
-                            click.echo(f"  {output.get('content', '')}")
-                    return
-                elif state == "failed":
-                    click.echo(f"{Fore.RED}Task failed!")
-                    if status.get("outputs"):
-                        click.echo(f"{Fore.YELLOW}Error details:")
-                        for output in status["outputs"]:
-                            click.echo(f"  {output.get('content', '')}")
-                    return
-                elif state == "pending":
-                    click.echo(f"{Fore.YELLOW}Task still pending...")
-                
-                time.sleep(2)
-            
-            click.echo(f"{Fore.YELLOW}Timeout reached. Task may still be running.")
-            click.echo(f"Use 'python cli/a2a_cli.py task status {task_id} {orchestrator['endpoint']}' to check progress.")
+            wait_for_task(orchestrator["endpoint"], task_id, timeout, keep_running)
             
     except Exception as e:
         click.echo(f"{Fore.RED}Error: {e}")
@@ -363,7 +1207,9 @@ def submit_task(prompt, wait, timeout):
 @click.argument("agent_name")
 @click.argument("prompt")
 @click.option("--wait", is_flag=True, help="Wait for task completion")
-def submit_to_agent(agent_name, prompt, wait):
+@click.option("--timeout", default=300, help="Timeout for waiting (seconds)")
+@click.option("--keep-running", is_flag=True, help="Do not cancel the task when the wait times out")
+def submit_to_agent(agent_name, prompt, wait, timeout, keep_running):
     """Submit a task to a specific agent"""
     try:
         agents_data = client.get_agents()
@@ -374,7 +1220,8 @@ def submit_to_agent(agent_name, prompt, wait):
             return
         
         click.echo(f"{Fore.CYAN}Submitting task to {agent_name}...")
-        task_data = client.submit_task(agent["endpoint"], prompt)
+        deadline = time.time() + timeout if wait and not keep_running else None
+        task_data = client.submit_task(agent["endpoint"], prompt, deadline=deadline)
         task_id = task_data.get("task_id")
         
         click.echo(f"{Fore.GREEN}Task submitted successfully!")
@@ -383,31 +1230,24 @@ def submit_to_agent(agent_name, prompt, wait):
         
         if wait:
             click.echo(f"{Fore.CYAN}Waiting for completion...")
-            start_time = time.time()
-            while time.time() - start_time < 300:  # 5 minute timeout
-                status = client.get_task_status(agent["endpoint"], task_id)
-                state = status.get("state")
-                
-                if state == "completed":
-                    click.echo(f"{Fore.GREEN}Task completed successfully!")
-                    if status.get("outputs"):
-                        click.echo(f"{Fore.CYAN}Results:")
-                        for output in status["outputs"]:
-                            click.echo(f"  {output.get('content', '')}")
-                    return
-                elif state == "failed":
-                    click.echo(f"{Fore.RED}Task failed!")
-                    if status.get("outputs"):
-                        click.echo(f"{Fore.YELLOW}Error details:")
-                        for output in status["outputs"]:
-                            click.echo(f"  {output.get('content', '')}")
-                    return
-                
-                time.sleep(2)
+            wait_for_task(agent["endpoint"], task_id, timeout, keep_running)
             
     except Exception as e:
         click.echo(f"{Fore.RED}Error: {e}")
 
+@task.command("cancel")
+@click.argument("task_id")
+@click.argument("agent_endpoint")
+def task_cancel_cmd(task_id, agent_endpoint):
+    """Cancel a running task"""
+    try:
+        result = client.cancel_task(agent_endpoint, task_id)
+        click.echo(f"{Fore.GREEN}Cancellation requested for task {task_id}")
+        if result.get("state"):
+            click.echo(f"State: {result['state']}")
+    except Exception as e:
+        click.echo(f"{Fore.RED}Error: {e}")
+
 @task.command("status")
 @click.argument("task_id")
 @click.argument("agent_endpoint")
@@ -433,25 +1273,174 @@ def task_status_cmd(task_id, agent_endpoint):
     except Exception as e:
         click.echo(f"{Fore.RED}Error: {e}")
 
+def _read_task_list(task_file, default_endpoint: Optional[str]) -> List[tuple]:
+    """Parse task references: JSON objects or 'task_id [endpoint]' lines"""
+    tasks = []
+    for line_num, line in enumerate(task_file, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("{"):
+            try:
+                item = json.loads(line)
+                tasks.append((item["task_id"], item.get("endpoint") or default_endpoint))
+            except (KeyError, ValueError) as e:
+                raise click.UsageError(f"Invalid task on line {line_num} of {task_file.name}: {line!r} ({e!r})")
+        else:
+            parts = line.split()
+            tasks.append((parts[0], parts[1] if len(parts) > 1 else default_endpoint))
+    return tasks
+
+def _format_stat(value, spec: str) -> str:
+    """Format an optional statistic"""
+    return "N/A" if value is None else format(value, spec)
+
+def print_export_summary(summary: Dict[str, Any]):
+    """Print export summary statistics as a table"""
+    rows = [
+        ["Tasks", str(summary["tasks"])],
+        ["Fetch errors", str(summary["fetch_errors"])],
+    ]
+    for state, count in sorted(summary["states"].items()):
+        rows.append([f"State: {state}", str(count)])
+    rows.extend([
+        ["Success rate", _format_stat(summary["success_rate"], ".1%")],
+        ["Output bytes (total)", str(summary["output_bytes_total"])],
+        ["Output bytes (avg)", _format_stat(summary["output_bytes_avg"], ".0f")],
+        ["Duration p50 / p90 / p99 (s)", " / ".join(
+            _format_stat(summary[f"duration_p{p}_s"], ".2f") for p in (50, 90, 99))],
+        ["Fetch latency p50 / p95 (ms)", " / ".join(
+            _format_stat(summary[f"latency_p{p}_ms"], ".1f") for p in (50, 95))],
+    ])
+    print_table(["Metric", "Value"], rows, "Export Summary")
+
+@task.command("export")
+@click.argument("output", type=click.Path(dir_okay=False, path_type=Path))
+@click.argument("task_ids", nargs=-1)
+@click.option("--endpoint", help="Agent endpoint for task IDs listed without one")
+@click.option("--input", "task_file", type=click.File("r"),
+              help="File of tasks ('-' for stdin): 'task_id [endpoint]' lines or JSON objects")
+@click.option("--format", type=click.Choice(["jsonl", "csv", "parquet"]),
+              help="Output format (default: from OUTPUT extension, else jsonl)")
+@click.option("--concurrency", type=click.IntRange(min=1), help="Maximum concurrent requests (default: max_workers)")
+@click.option("--resume", is_flag=True, help="Skip tasks already exported to OUTPUT")
+@click.option("--summary-json", type=click.Path(dir_okay=False, path_type=Path),
+              help="Also write the summary statistics to this JSON file")
+def export_tasks(output, task_ids, endpoint, task_file, format, concurrency, resume, summary_json):
+    """Export results of many tasks to a JSONL, CSV or Parquet file"""
+    tasks = [(task_id, endpoint) for task_id in task_ids]
+    if task_file:
+        tasks.extend(_read_task_list(task_file, endpoint))
+    missing = [task_id for task_id, task_endpoint in tasks if not task_endpoint]
+    if missing:
+        raise click.UsageError(f"No endpoint for task(s) {', '.join(missing[:5])}; use --endpoint")
+    tasks = list(dict.fromkeys(tasks))
+    
+    try:
+        format = format or {".csv": "csv", ".parquet": "parquet"}.get(output.suffix.lower(), "jsonl")
+        writer = TaskExportWriter(output, format, resume)
+        stats = ExportStats()
+        
+        carried_over = []
+        if resume:
+            # Last row wins; rows for tasks fetched again are dropped from the file
+            previous = {(r["task_id"], r["endpoint"]): r for r in writer.read_existing()}
+            done = {key for key, record in previous.items() if not record.get("error")}
+            tasks = [t for t in tasks if t not in done]
+            retried = set(tasks)
+            carried_over = [r for key, r in previous.items() if key not in retried]
+            for record in carried_over:
+                stats.add(record)
+            click.echo(f"{Fore.CYAN}Resuming: {len(done)} task(s) already exported, {len(tasks)} remaining")
+        
+        concurrency = concurrency or config.get("max_workers", 8)
+        client.configure_pool(concurrency)
+        writer.open(carried_over)
+        try:
+            with click.progressbar(length=len(tasks), label=f"Exporting to {output}") as progress:
+                export_task_results(tasks, writer, stats, concurrency, progress)
+        finally:
+            writer.close()
+        
+        summary = stats.summary()
+        print_export_summary(summary)
+        if summary_json:
+            _atomic_write_json(summary_json, summary)
+            
+    except Exception as e:
+        click.echo(f"{Fore.RED}Error: {e}")
+
 @cli.group()
 def mcp():
     """Work with MCP (Model Context Protocol) tools"""
     pass
 
+def _tools_dir_option(f):
+    """Shared --tools-dir option for MCP commands"""
+    return click.option("--tools-dir", default="tools", show_default=True,
+                        type=click.Path(file_okay=False, path_type=Path),
+                        help="Directory containing MCP tool modules")(f)
+
 @mcp.command("list")
-def list_mcp_tools():
+@_tools_dir_option
+@click.option("--format", type=click.Choice(["table", "json"]), default="table", help="Output format")
+@click.option("--refresh", is_flag=True, help="Rebuild the tool index from scratch")
+def list_mcp_tools(tools_dir, format, refresh):
     """List available MCP tools"""
-    tools_dir = Path("tools")
     if not tools_dir.exists():
         click.echo(f"{Fore.RED}Tools directory not found")
         return
     
-    click.echo(f"{Fore.CYAN}Available MCP Tools:{Style.RESET_ALL}")
-    click.echo("=" * 20)
+    entries = ToolIndex(config.config_dir / "mcp_index.json").refresh(tools_dir, force=refresh)
+    
+    if format == "json":
+        click.echo(json.dumps(entries, indent=2))
+        return
+    
+    headers = ["Module", "Tools", "Description"]
+    rows = []
+    for entry in entries:
+        tool_names = ", ".join(tool["name"] for tool in entry["tools"]) or "-"
+        description = entry.get("error") and f"{Fore.RED}{entry['error']}{Style.RESET_ALL}"
+        rows.append([Path(entry["file"]).stem, tool_names, description or entry["description"]])
+    
+    print_table(headers, rows, f"Available MCP Tools ({len(entries)})")
+
+@mcp.command("info")
+@click.argument("tool_name")
+@_tools_dir_option
+def mcp_tool_info(tool_name, tools_dir):
+    """Show description and parameters of an MCP tool"""
+    if not tools_dir.exists():
+        click.echo(f"{Fore.RED}Tools directory not found")
+        return
+    
+    entry = ToolIndex(config.config_dir / "mcp_index.json").find(tools_dir, tool_name)
+    if not entry:
+        click.echo(f"{Fore.RED}MCP tool '{tool_name}' not found")
+        return
+    
+    click.echo(f"\n{Fore.CYAN}{Style.BRIGHT}MCP Tool: {entry['name']}{Style.RESET_ALL}")
+    click.echo("=" * 40)
+    click.echo(f"{Fore.GREEN}File:{Style.RESET_ALL} {entry['file']}")
+    click.echo(f"{Fore.GREEN}Description:{Style.RESET_ALL} {entry['description']}")
+    if entry.get("error"):
+        click.echo(f"{Fore.RED}{entry['error']}")
     
-    for tool_file in tools_dir.glob("*.py"):
-        if tool_file.name != "__init__.py":
-            click.echo(f"  📁 {tool_file.stem}")
+    for tool in entry["tools"]:
+        click.echo(f"\n{Fore.CYAN}{tool['name']}{Style.RESET_ALL}: {tool['description']}")
+        params = tool["parameters"]
+        if isinstance(params.get("properties"), dict):
+            # JSON schema style: {"properties": {...}, "required": [...]}
+            required_names = set(params.get("required") or [])
+            params = {name: {**spec, "required": name in required_names}
+                      for name, spec in params["properties"].items() if isinstance(spec, dict)}
+        for param, spec in params.items():
+            if not isinstance(spec, dict):
+                click.echo(f"  {param}: {json.dumps(spec)}")
+                continue
+            required = "required" if spec.get("required") else f"default={spec.get('default')!r}"
+            click.echo(f"  {param} ({spec.get('type', 'any')}, {required})")
 
 @cli.command("interactive")
 def interactive_mode():
@@ -472,6 +1461,7 @@ def interactive_mode():
                 click.echo("  agents status - Check agent health")
                 click.echo("  task submit <prompt> - Submit task to orchestrator")
                 click.echo("  mcp list - List MCP tools")
+                click.echo("  mcp info <tool> - Show MCP tool details")
                 click.echo("  exit - Exit interactive mode")
             else:
                 # Default to submitting as a task
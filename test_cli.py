@@ -5,8 +5,15 @@ Simple test script for A2A CLI
 Tests basic functionality without requiring a running A2A system.
 """
 
+import json
+import os
+import socket
 import sys
+import tempfile
+import threading
+import time
 import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from unittest.mock import patch, MagicMock
 from pathlib import Path
 
@@ -14,7 +21,12 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 try:
-    from a2a_cli import A2AConfig, A2AClient, print_table
+    from a2a_cli import (
+        A2AConfig, A2AClient, ToolIndex, DEADLINE_HEADER, MCP_PARALLEL_THRESHOLD, ExportStats, TaskExportWriter,
+        cli, export_task_results, print_table, wait_for_task,
+    )
+    import a2a_cli
+    from click.testing import CliRunner
     import click
 except ImportError as e:
     print(f"Error importing modules: {e}")
@@ -39,6 +51,73 @@ class TestA2AConfig(unittest.TestCase):
         self.config.set("test_key", "test_value")
         self.assertEqual(self.config.get("test_key"), "test_value")
 
+class TestA2AConfigProfiles(unittest.TestCase):
+    """Test profiles, environment overrides and config file writes"""
+    
+    def setUp(self):
+        """Point the config at a temporary directory"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.env = patch.dict(os.environ, {"A2A_CONFIG_DIR": self.tmp.name})
+        self.env.start()
+        for name in ("A2A_PROFILE", "A2A_TIMEOUT", "A2A_REGISTRY_URL", "A2A_REGISTRY_URLS"):
+            os.environ.pop(name, None)
+    
+    def tearDown(self):
+        """Restore the environment and remove temporary files"""
+        self.env.stop()
+        self.tmp.cleanup()
+    
+    def test_profile_overrides_base(self):
+        """Test a selected profile overrides base settings"""
+        config = A2AConfig()
+        config.set("timeout", 10)
+        config.set("timeout", 99, profile="slow")
+        
+        self.assertEqual(A2AConfig().get("timeout"), 10)
+        self.assertEqual(A2AConfig(profile="slow").get("timeout"), 99)
+        self.assertEqual(list(config.profiles()), ["slow"])
+    
+    def test_env_overrides(self):
+        """Test A2A_<KEY> environment variables take precedence"""
+        os.environ["A2A_TIMEOUT"] = "5"
+        os.environ["A2A_REGISTRY_URLS"] = "http://a, http://b"
+        config = A2AConfig()
+        self.assertEqual(config.get("timeout"), 5)
+        self.assertEqual(config.get("registry_urls"), ["http://a", "http://b"])
+        
+        config.config["log_level"] = "DEBUG"
+        config.save_config()
+        with open(config.config_file) as f:
+            self.assertEqual(json.load(f), {"log_level": "DEBUG"})
+    
+    def test_env_registry_url_replaces_list(self):
+        """Test A2A_REGISTRY_URL wins over registry_urls from the file"""
+        A2AConfig().set("registry_urls", ["http://eu-1", "http://eu-2"])
+        os.environ["A2A_REGISTRY_URL"] = "http://staging:8000"
+        
+        client = A2AClient(A2AConfig())
+        self.assertEqual(client.registry_urls, ["http://staging:8000"])
+    
+    def test_config_set_coerces_types(self):
+        """Test config set converts values to the setting's type"""
+        config = A2AConfig()
+        runner = CliRunner()
+        with patch('a2a_cli.config', config):
+            runner.invoke(cli, ["config", "set", "registry_urls", "http://r1:8000,http://r2:8000"])
+            self.assertEqual(config.get("registry_urls"), ["http://r1:8000", "http://r2:8000"])
+            runner.invoke(cli, ["config", "set", "timeout", "15"])
+            self.assertEqual(config.get("timeout"), 15)
+            
+            result = runner.invoke(cli, ["config", "set", "timeout", "abc"])
+            self.assertEqual(result.exit_code, 2)
+            self.assertIn("must be an integer", result.output)
+            self.assertEqual(config.get("timeout"), 15)
+    
+    def test_unknown_profile(self):
+        """Test switching to an undefined profile is rejected"""
+        with self.assertRaises(click.BadParameter):
+            A2AConfig().use_profile("missing")
+
 class TestA2AClient(unittest.TestCase):
     """Test A2A client functionality"""
     
@@ -53,6 +132,22 @@ class TestA2AClient(unittest.TestCase):
         self.assertEqual(self.client.timeout, 30)
         self.assertIsNotNone(self.client.session)
     
+    def test_registry_urls_normalised(self):
+        """Test a string registry_urls is split and invalid values are ignored"""
+        self.config.config["registry_urls"] = "http://r1:8000, http://r2:8000"
+        self.client.apply_config()
+        self.assertEqual(self.client.registry_urls, ["http://r1:8000", "http://r2:8000"])
+        
+        self.config.config["registry_urls"] = {"url": "http://r1:8000"}
+        with patch('click.echo'):
+            self.client.apply_config()
+        self.assertEqual(self.client.registry_urls, [self.client.registry_url])
+    
+    def test_connection_pool_size(self):
+        """Test the connection pool grows with the requested concurrency"""
+        self.client.configure_pool(32)
+        self.assertEqual(self.client.session.get_adapter("http://x")._pool_maxsize, 32)
+    
     @patch('requests.Session.get')
     def test_get_agents_success(self, mock_get):
         """Test successful agent retrieval"""
@@ -77,6 +172,295 @@ class TestA2AClient(unittest.TestCase):
         with self.assertRaises(click.ClickException):
             self.client.get_agents()
 
+    @patch('requests.Session.get')
+    def test_get_agents_federated(self, mock_get):
+        """Test agents from several registries are merged and tagged"""
+        def fake_get(url, **kwargs):
+            if url.startswith("http://east"):
+                raise Exception("Connection failed")
+            response = MagicMock()
+            response.json.return_value = [
+                {"name": "Shared", "endpoint": "http://localhost:8001/"},
+                {"name": url, "endpoint": url + "/agent"},
+            ]
+            return response
+        mock_get.side_effect = fake_get
+        self.client.registry_urls = ["http://a", "http://b", "http://east"]
+        
+        agents = self.client.get_agents()
+        self.assertEqual(len(agents), 3)
+        shared = next(a for a in agents if a["name"] == "Shared")
+        self.assertEqual(shared["registry"], "http://a")
+        self.assertEqual(shared["registries"], ["http://a", "http://b"])
+        self.assertIn("http://east", self.client.registry_errors)
+    
+    def test_get_agents_hanging_registry(self):
+        """Test a registry that never answers times out instead of blocking"""
+        class AgentsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = json.dumps([{"name": "Live", "endpoint": "http://live"}]).encode()
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, *args):
+                pass
+        
+        live = HTTPServer(("127.0.0.1", 0), AgentsHandler)
+        threading.Thread(target=live.serve_forever, daemon=True).start()
+        silent = socket.socket()
+        silent.bind(("127.0.0.1", 0))
+        silent.listen(1)  # accepts connections but never responds
+        try:
+            self.client.timeout = 0.5
+            self.client.registry_urls = [
+                f"http://127.0.0.1:{live.server_address[1]}",
+                f"http://127.0.0.1:{silent.getsockname()[1]}",
+            ]
+            start = time.time()
+            agents = self.client.get_agents()
+            self.assertLess(time.time() - start, 5)
+            self.assertEqual([a["name"] for a in agents], ["Live"])
+            self.assertIn(self.client.registry_urls[1], self.client.registry_errors)
+        finally:
+            live.shutdown()
+            live.server_close()
+            silent.close()
+    
+    @patch('requests.Session.post')
+    def test_submit_task_deadline_header(self, mock_post):
+        """Test task submission carries the deadline header"""
+        mock_post.return_value.json.return_value = {"task_id": "t1"}
+        
+        self.client.submit_task("http://localhost:8001", "hello", deadline=0)
+        headers = mock_post.call_args.kwargs["headers"]
+        self.assertEqual(headers[DEADLINE_HEADER], "1970-01-01T00:00:00+00:00")
+    
+    @patch('requests.Session.post')
+    def test_cancel_task(self, mock_post):
+        """Test task cancellation request"""
+        mock_post.return_value.content = b""
+        
+        self.assertEqual(self.client.cancel_task("http://localhost:8001", "t1"), {})
+        mock_post.assert_called_with("http://localhost:8001/task/t1/cancel", timeout=self.client.timeout)
+
+class TestWaitForTask(unittest.TestCase):
+    """Test waiting on tasks and cancellation"""
+    
+    @patch('click.echo')
+    @patch('a2a_cli.client')
+    def test_timeout_cancels_task(self, mock_client, mock_echo):
+        """Test an expired wait sends a cancel request"""
+        wait_for_task("http://localhost:8001", "t1", timeout=0)
+        mock_client.cancel_task.assert_called_once_with("http://localhost:8001", "t1")
+    
+    @patch('click.echo')
+    @patch('a2a_cli.client')
+    def test_keep_running_skips_cancel(self, mock_client, mock_echo):
+        """Test --keep-running leaves the task alone on timeout"""
+        wait_for_task("http://localhost:8001", "t1", timeout=0, keep_running=True)
+        mock_client.cancel_task.assert_not_called()
+    
+    @patch('click.echo')
+    @patch('a2a_cli.client')
+    def test_interrupt_cancels_task(self, mock_client, mock_echo):
+        """Test Ctrl-C while waiting cancels the task and propagates"""
+        mock_client.get_task_status.side_effect = KeyboardInterrupt
+        with self.assertRaises(KeyboardInterrupt):
+            wait_for_task("http://localhost:8001", "t1", timeout=60)
+        mock_client.cancel_task.assert_called_once_with("http://localhost:8001", "t1")
+
+    @patch('click.echo')
+    @patch('a2a_cli.client')
+    def test_status_error_cancels_task(self, mock_client, mock_echo):
+        """Test a failed status poll cancels the task unless --keep-running"""
+        mock_client.get_task_status.side_effect = click.ClickException("Failed to get task status")
+        with self.assertRaises(click.ClickException):
+            wait_for_task("http://localhost:8001", "t1", timeout=60)
+        mock_client.cancel_task.assert_called_once_with("http://localhost:8001", "t1")
+        
+        mock_client.cancel_task.reset_mock()
+        with self.assertRaises(click.ClickException):
+            wait_for_task("http://localhost:8001", "t1", timeout=60, keep_running=True)
+        mock_client.cancel_task.assert_not_called()
+
+class TestTaskExport(unittest.TestCase):
+    """Test task result export and summary statistics"""
+    
+    def setUp(self):
+        """Set up a temporary output directory"""
+        self.tmp = tempfile.TemporaryDirectory()
+    
+    def tearDown(self):
+        """Remove temporary files"""
+        self.tmp.cleanup()
+    
+    def _export(self, path, fmt, tasks, resume=False):
+        """Run an export against a mocked client"""
+        def fake_status(endpoint, task_id):
+            if task_id == "bad":
+                raise click.ClickException("Failed to get task status")
+            return {"state": "completed", "outputs": [{"content": task_id}], "duration": 1.5}
+        
+        writer = TaskExportWriter(path, fmt, resume)
+        carried_over = writer.read_existing() if resume else []
+        stats = ExportStats()
+        with patch('a2a_cli.client') as mock_client:
+            mock_client.get_task_status.side_effect = fake_status
+            writer.open(carried_over)
+            export_task_results(tasks, writer, stats, concurrency=2)
+            writer.close()
+        return stats, writer.read_existing()
+    
+    def test_export_jsonl_and_resume(self):
+        """Test JSONL export streams records and resume appends"""
+        path = Path(self.tmp.name) / "out.jsonl"
+        tasks = [("t1", "http://a"), ("bad", "http://a"), ("t3", "http://a")]
+        stats, records = self._export(path, "jsonl", tasks)
+        self.assertEqual(len(records), 3)
+        self.assertEqual(stats.summary()["fetch_errors"], 1)
+        self.assertEqual(stats.summary()["success_rate"], 1.0)
+        
+        _, records = self._export(path, "jsonl", [("t4", "http://a")], resume=True)
+        self.assertEqual([r["task_id"] for r in records][-1], "t4")
+        self.assertEqual(len(records), 4)
+    
+    def test_resume_after_crash(self):
+        """Test resume drops a half-written last line and retried error rows"""
+        path = Path(self.tmp.name) / "out.jsonl"
+        self._export(path, "jsonl", [("t1", "http://a"), ("bad", "http://a")])
+        with open(path, "a") as f:
+            f.write('{"task_id": "t2", "endp')
+        
+        def fake_status(endpoint, task_id):
+            return {"state": "completed", "outputs": [{"content": task_id}]}
+        with patch('a2a_cli.client') as mock_client:
+            mock_client.get_task_status.side_effect = fake_status
+            result = CliRunner().invoke(cli, [
+                "task", "export", str(path), "t1", "bad", "t2", "--endpoint", "http://a", "--resume",
+            ])
+        self.assertIn("1 task(s) already exported, 2 remaining", result.output)
+        
+        records = TaskExportWriter(path, "jsonl").read_existing()
+        self.assertEqual(sorted(r["task_id"] for r in records), ["bad", "t1", "t2"])
+        self.assertTrue(all(r["error"] is None for r in records))
+    
+    def test_resume_csv_multiline_output(self):
+        """Test a CSV row cut off inside a quoted multi-line output is discarded"""
+        path = Path(self.tmp.name) / "out.csv"
+        self._export(path, "csv", [("t1", "http://a")])
+        with open(path, "a", newline="") as f:
+            f.write('t2,http://a,completed,,"line1\n')
+        
+        writer = TaskExportWriter(path, "csv", resume=True)
+        records = writer.read_existing()
+        self.assertEqual([r["task_id"] for r in records], ["t1"])
+        self.assertTrue(path.read_text().endswith("\n"))
+        self.assertNotIn("line1", path.read_text())
+        
+        def fake_status(endpoint, task_id):
+            return {"state": "completed", "outputs": [{"content": "a"}, {"content": "b"}]}
+        with patch('a2a_cli.client') as mock_client:
+            mock_client.get_task_status.side_effect = fake_status
+            writer.open(records)
+            export_task_results([("t2", "http://a")], writer, ExportStats(), concurrency=1)
+            writer.close()
+        records = TaskExportWriter(path, "csv").read_existing()
+        self.assertEqual([(r["task_id"], r["output"]) for r in records], [("t1", "t1"), ("t2", "a\nb")])
+    
+    def test_invalid_task_list_line(self):
+        """Test a malformed --input line is a usage error naming the line"""
+        task_file = Path(self.tmp.name) / "tasks.txt"
+        task_file.write_text('t1\n{"id": "t2"}\n')
+        result = CliRunner().invoke(cli, [
+            "task", "export", str(Path(self.tmp.name) / "out.jsonl"),
+            "--input", str(task_file), "--endpoint", "http://a",
+        ])
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn("line 2", result.output)
+    
+    def test_parquet_requires_pyarrow(self):
+        """Test a missing pyarrow is reported before touching the file"""
+        if a2a_cli.pq is not None:
+            self.skipTest("pyarrow is installed")
+        with self.assertRaises(click.ClickException):
+            TaskExportWriter(Path(self.tmp.name) / "out.parquet", "parquet", resume=True)
+    
+    def test_export_csv_types(self):
+        """Test CSV records are read back with numeric fields restored"""
+        path = Path(self.tmp.name) / "out.csv"
+        _, records = self._export(path, "csv", [("t1", "http://a")])
+        self.assertEqual(records[0]["output_bytes"], 2)
+        self.assertEqual(records[0]["duration_s"], 1.5)
+        self.assertIsNone(records[0]["error"])
+    
+    def test_percentiles(self):
+        """Test duration percentiles in the summary"""
+        stats = ExportStats()
+        for i in range(1, 101):
+            stats.add({"state": "completed", "duration_s": float(i), "output_bytes": 1})
+        summary = stats.summary()
+        self.assertEqual(summary["duration_p50_s"], 50.0)
+        self.assertEqual(summary["duration_p99_s"], 99.0)
+        self.assertEqual(summary["output_bytes_total"], 100)
+
+class TestToolIndex(unittest.TestCase):
+    """Test static MCP tool indexing"""
+    
+    def setUp(self):
+        """Set up a temporary tools directory and index file"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.tools_dir = Path(self.tmp.name) / "tools"
+        self.tools_dir.mkdir()
+        self.index = ToolIndex(Path(self.tmp.name) / "mcp_index.json")
+        (self.tools_dir / "web.py").write_text(
+            '"""Web tools"""\n'
+            "@mcp.tool()\n"
+            "def fetch(url: str, timeout: int = 10):\n"
+            '    """Fetch a URL"""\n'
+        )
+    
+    def tearDown(self):
+        """Remove temporary files"""
+        self.tmp.cleanup()
+    
+    def test_extracts_metadata(self):
+        """Test tool names, descriptions and parameters are extracted"""
+        entries = self.index.refresh(self.tools_dir)
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["description"], "Web tools")
+        tool = entries[0]["tools"][0]
+        self.assertEqual(tool["name"], "fetch")
+        self.assertEqual(tool["description"], "Fetch a URL")
+        self.assertEqual(tool["parameters"]["url"], {"type": "string", "required": True})
+        self.assertEqual(tool["parameters"]["timeout"]["default"], 10)
+    
+    def test_parallel_parse(self):
+        """Test enough changed files are parsed in a process pool with the same results"""
+        from concurrent.futures import ProcessPoolExecutor
+        for i in range(MCP_PARALLEL_THRESHOLD):
+            (self.tools_dir / f"tool_{i:03d}.py").write_text(f'TOOL_NAME = "t{i}"\nINPUT_SCHEMA = {{}}\n')
+        
+        with patch("a2a_cli.ProcessPoolExecutor", wraps=ProcessPoolExecutor) as mock_pool:
+            entries = self.index.refresh(self.tools_dir)
+            mock_pool.assert_called_once()
+        self.assertEqual(len(entries), MCP_PARALLEL_THRESHOLD + 1)
+        self.assertEqual(entries[0]["tools"][0]["name"], "t0")
+        self.assertEqual(entries[-1]["tools"][0]["name"], "fetch")
+    
+    def test_incremental_refresh(self):
+        """Test unchanged files are served from cache and edits are picked up"""
+        self.index.refresh(self.tools_dir)
+        with patch("a2a_cli._parse_tool_file") as mock_parse:
+            self.index.refresh(self.tools_dir)
+            mock_parse.assert_not_called()
+        
+        (self.tools_dir / "web.py").write_text('TOOL_NAME = "web"\nINPUT_SCHEMA = {"type": "object"}\n')
+        entries = self.index.refresh(self.tools_dir)
+        self.assertEqual(entries[0]["tools"][0]["name"], "web")
+        self.assertIsNotNone(self.index.find(self.tools_dir, "web"))
+
 class TestUtilityFunctions(unittest.TestCase):
     """Test utility functions"""
     
@@ -104,7 +488,11 @@ def run_tests():
     
     # Add test cases
     suite.addTest(unittest.makeSuite(TestA2AConfig))
+    suite.addTest(unittest.makeSuite(TestA2AConfigProfiles))
     suite.addTest(unittest.makeSuite(TestA2AClient))
+    suite.addTest(unittest.makeSuite(TestWaitForTask))
+    suite.addTest(unittest.makeSuite(TestTaskExport))
+    suite.addTest(unittest.makeSuite(TestToolIndex))
     suite.addTest(unittest.makeSuite(TestUtilityFunctions))
     
     # Run tests